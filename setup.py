@@ -12,6 +12,10 @@ physicell_requirements = [
     "scipy>=1.5.2",
 ]
 
+orjson_requirements = [
+    "orjson>=3.4.0",
+]
+
 setup_requirements = [
     "pytest-runner>=5.2",
 ]
@@ -53,10 +57,12 @@ extra_requirements = {
     "test": test_requirements,
     "dev": dev_requirements,
     "physicell": physicell_requirements,
+    "orjson": orjson_requirements,
     "all": [
         *requirements,
         *dev_requirements,
-        *physicell_requirements
+        *physicell_requirements,
+        *orjson_requirements,
     ]
 }
 
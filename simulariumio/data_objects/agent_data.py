@@ -2,10 +2,9 @@
 # -*- coding: utf-8 -*-
 from __future__ import annotations
 
-import copy
+import itertools
 import logging
 from typing import List, Tuple, Dict, Any
-import math
 
 import numpy as np
 import pandas as pd
@@ -19,6 +18,14 @@ log = logging.getLogger(__name__)
 
 ###############################################################################
 
+# index of an agent's subpoint count within its values in a frame's buffer
+_NSP_INDEX = V1_SPATIAL_BUFFER_STRUCT.NSP_INDEX
+# distance from one agent's subpoint count to the next agent's,
+# not counting the first agent's subpoint values
+_NSP_TO_NEXT_NSP = V1_SPATIAL_BUFFER_STRUCT.SP_INDEX
+
+###############################################################################
+
 
 class AgentData:
     times: np.ndarray
@@ -30,7 +37,6 @@ class AgentData:
     rotations: np.ndarray
     radii: np.ndarray
     n_subpoints: np.ndarray = None
-    subpoints: np.ndarray = None
     draw_fiber_points: bool = False
     type_ids: np.ndarray
     type_mapping: Dict[str, Any]
@@ -88,13 +94,13 @@ class AgentData:
             A numpy ndarray containing the number of subpoints
             belonging to each agent at each timestep. Required if
             subpoints are provided
-            Default: None
+            Default: 0 for each agent
         subpoints : np.ndarray
         (shape = [timesteps, agents, subpoints, 3]) (optional)
             A numpy ndarray containing a list of subpoint position data
             for each agent at each timestep. These values are
             currently only used for fiber agents
-            Default: None
+            Default: zeros (shape = [timesteps, agents]), no subpoints
         draw_fiber_points: bool (optional)
             Draw spheres at every other fiber point for fibers?
             Default: False
@@ -117,35 +123,193 @@ class AgentData:
         self.type_ids = type_ids
         self.type_mapping = None
 
+    @property
+    def subpoints(self) -> np.ndarray:
+        """
+        Subpoints as a dense array (shape = [timesteps, agents, subpoints, 3]),
+        if they are stored packed they are unpacked on first access
+        """
+        if self._subpoints is None and self._packed_subpoints is not None:
+            self._subpoints = AgentData._unpack_subpoints(*self._packed_subpoints)
+            self._packed_subpoints = None
+        return self._subpoints
+
+    @subpoints.setter
+    def subpoints(self, subpoints: np.ndarray):
+        self._subpoints = subpoints
+        self._packed_subpoints = None
+
+    @property
+    def has_subpoints(self) -> bool:
+        """
+        Are subpoints set (either dense or packed)?
+        Checking this does not unpack packed subpoints
+        """
+        return self._subpoints is not None or self._packed_subpoints is not None
+
+    def set_packed_subpoints(
+        self, packed_subpoints: np.ndarray, n_subpoints: np.ndarray = None
+    ):
+        """
+        Store subpoints packed in a flat array (shape = [total subpoints, 3])
+        holding every agent's subpoints back to back in timestep then agent order,
+        instead of zero-padded to the max subpoints
+
+        Parameters
+        ----------
+        packed_subpoints : np.ndarray (shape = [total subpoints, 3])
+            The subpoints of every agent at every timestep, back to back
+        n_subpoints : np.ndarray (shape = [timesteps, agents]) (optional)
+            The number of subpoints packed for each agent at each timestep.
+            This is only the layout of packed_subpoints, the number of subpoints
+            read for each agent is still n_subpoints of this AgentData
+            Default: n_subpoints of this AgentData
+        """
+        if n_subpoints is None:
+            n_subpoints = self.n_subpoints
+        # copy the counts so editing n_subpoints doesn't change the layout
+        packed_counts = np.array(n_subpoints, dtype=int)
+        ends = np.cumsum(packed_counts).reshape(packed_counts.shape)
+        self._subpoints = None
+        self._packed_subpoints = (
+            packed_subpoints,
+            packed_counts,
+            ends - packed_counts,
+        )
+
+    def get_packed_subpoints(self) -> np.ndarray:
+        """
+        Get the packed subpoints (shape = [total subpoints, 3])
+        if subpoints are stored packed, otherwise None
+        """
+        if self._subpoints is None and self._packed_subpoints is not None:
+            return self._packed_subpoints[0]
+        return None
+
+    def get_packed_n_subpoints(self) -> np.ndarray:
+        """
+        Get the number of subpoints packed for each agent at each timestep
+        (shape = [timesteps, agents]) if subpoints are stored packed,
+        otherwise None
+        """
+        if self._subpoints is None and self._packed_subpoints is not None:
+            return self._packed_subpoints[1]
+        return None
+
+    def get_subpoints(self, time_index: int, agent_index: int) -> np.ndarray:
+        """
+        Get the subpoints (shape = [subpoints, 3]) of one agent at one timestep,
+        without unpacking packed subpoints
+        """
+        n_sp = int(self.n_subpoints[time_index][agent_index])
+        if self._subpoints is None and self._packed_subpoints is not None:
+            packed_subpoints, packed_counts, offsets = self._packed_subpoints
+            # if n_subpoints was raised past what was packed,
+            # unpack to read the zero padding like dense subpoints
+            if n_sp <= packed_counts[time_index, agent_index]:
+                start = offsets[time_index, agent_index]
+                return packed_subpoints[start : start + n_sp]
+        return self.subpoints[time_index][agent_index][:n_sp]
+
     @staticmethod
-    def _get_buffer_data_dimensions(buffer_data: Dict[str, Any]) -> Tuple[int]:
-        """ """
-        bundle_data = buffer_data["spatialData"]["bundleData"]
-        total_steps = len(bundle_data)
+    def _unpack_subpoints(
+        packed_subpoints: np.ndarray, n_subpoints: np.ndarray, offsets: np.ndarray
+    ) -> np.ndarray:
+        """
+        Scatter packed subpoints into a dense zero-padded array
+        """
+        max_subpoints = int(np.amax(n_subpoints, initial=0))
+        result = np.zeros(
+            n_subpoints.shape + (max_subpoints, 3), dtype=packed_subpoints.dtype
+        )
+        # packed subpoints are in the same timestep then agent order as np.nonzero
+        time_ix, agent_ix = np.nonzero(n_subpoints)
+        counts = n_subpoints[time_ix, agent_ix]
+        point_ix = np.arange(np.sum(counts)) - np.repeat(
+            offsets[time_ix, agent_ix], counts
+        )
+        result[
+            np.repeat(time_ix, counts), np.repeat(agent_ix, counts), point_ix
+        ] = packed_subpoints
+        return result
+
+    @staticmethod
+    def _scan_frame(frame_data: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Get the index in a frame's buffer where each agent starts
+        and the number of subpoints for each agent
+        """
+        # this loop runs once per agent, so step directly between
+        # the agents' subpoint counts and bind the stride to a local
+        nsp_to_next_nsp = _NSP_TO_NEXT_NSP
+        buffer_size = len(frame_data)
+        nsp_offsets = []
+        n_sps = []
+        i = _NSP_INDEX
+        while i < buffer_size:
+            nsp_offsets.append(i)
+            n_values = int(frame_data[i])
+            n_sps.append(n_values // 3)
+            i += nsp_to_next_nsp + n_values
+        offsets = np.array(nsp_offsets, dtype=int) - _NSP_INDEX
+        return offsets, np.array(n_sps, dtype=int)
+
+    @staticmethod
+    def _decode_frame(
+        frame_data: np.ndarray,
+        frame_layout: Tuple[np.ndarray, np.ndarray],
+        viz_types: np.ndarray,
+        unique_ids: np.ndarray,
+        type_ids: np.ndarray,
+        positions: np.ndarray,
+        rotations: np.ndarray,
+        radii: np.ndarray,
+        n_subpoints: np.ndarray,
+    ) -> Tuple[int, np.ndarray]:
+        """
+        Fill the given (preallocated) rows for one timestep
+        with the agents in a frame's buffer, return the number of agents
+        and the frame's subpoints packed back to back (shape = [subpoints, 3])
+        """
+        offsets, n_sps = frame_layout
+        n = offsets.size
+        xyz = np.arange(3)
+        viz_types[:n] = frame_data[offsets + V1_SPATIAL_BUFFER_STRUCT.VIZ_TYPE_INDEX]
+        unique_ids[:n] = frame_data[offsets + V1_SPATIAL_BUFFER_STRUCT.UID_INDEX]
+        type_ids[:n] = frame_data[offsets + V1_SPATIAL_BUFFER_STRUCT.TID_INDEX]
+        positions[:n] = frame_data[
+            offsets[:, np.newaxis] + V1_SPATIAL_BUFFER_STRUCT.POSX_INDEX + xyz
+        ]
+        rotations[:n] = frame_data[
+            offsets[:, np.newaxis] + V1_SPATIAL_BUFFER_STRUCT.ROTX_INDEX + xyz
+        ]
+        radii[:n] = frame_data[offsets + V1_SPATIAL_BUFFER_STRUCT.R_INDEX]
+        n_subpoints[:n] = n_sps
+        # gather the subpoint values of every agent in one pass
+        n_values = 3 * n_sps
+        value_ix = np.arange(np.sum(n_values)) + np.repeat(
+            offsets
+            + V1_SPATIAL_BUFFER_STRUCT.SP_INDEX
+            - (np.cumsum(n_values) - n_values),
+            n_values,
+        )
+        return n, frame_data[value_ix].reshape(-1, 3)
+
+    @staticmethod
+    def _get_buffer_data_dimensions(
+        frame_layouts: List[Tuple[np.ndarray, np.ndarray]]
+    ) -> Tuple[int]:
+        """
+        Get the number of timesteps, max agents, and max subpoints
+        from the layouts returned by _scan_frame for each frame
+        """
+        total_steps = len(frame_layouts)
         max_n_agents = 0
         max_n_subpoints = 0
-        for t in range(total_steps):
-            data = bundle_data[t]["data"]
-            i = 0
-            n_agents = 0
-            while i < len(data):
-                # a new agent should start at this index
-                n_agents += 1
-                i += V1_SPATIAL_BUFFER_STRUCT.NSP_INDEX
-                # get the number of subpoints
-                n_sp = math.floor(data[i] / 3.0)
-                if n_sp > max_n_subpoints:
-                    max_n_subpoints = n_sp
-                i += int(
-                    data[i]
-                    + (
-                        V1_SPATIAL_BUFFER_STRUCT.VALUES_PER_AGENT
-                        - V1_SPATIAL_BUFFER_STRUCT.NSP_INDEX
-                        - 1
-                    )
-                )
-            if n_agents > max_n_agents:
-                max_n_agents = n_agents
+        for offsets, n_sps in frame_layouts:
+            max_n_agents = max(max_n_agents, offsets.size)
+            if n_sps.size > 0:
+                max_n_subpoints = max(max_n_subpoints, int(np.amax(n_sps)))
         return total_steps, max_n_agents, max_n_subpoints
 
     @staticmethod
@@ -161,121 +325,161 @@ class AgentData:
             n = len(type_names[t])
             if n > max_agents:
                 max_agents = n
-        use_existing_ids = True
         if type_ids is None:
-            type_ids = np.zeros((len(type_names), max_agents))
-            use_existing_ids = False
+            # factorize the padded names, empty names get code -1
+            names = np.full((total_steps, max_agents), None, dtype=object)
+            for t in range(total_steps):
+                names[t, : len(type_names[t])] = type_names[t]
+            names[names == ""] = None
+            codes, unique_names = pd.factorize(names.ravel())
+            type_ids = np.maximum(codes, 0).reshape(total_steps, max_agents)
+            type_name_mapping = {
+                str(tid): {"name": tn} for tid, tn in enumerate(unique_names)
+            }
+            return type_ids.astype(float), type_name_mapping
         type_name_mapping = {}
         type_id_mapping = {}
-        last_tid = 0
         for t in range(total_steps):
             for n in range(len(type_names[t])):
                 tn = type_names[t][n]
                 if len(tn) == 0:
                     continue
                 if tn not in type_id_mapping:
-                    if use_existing_ids:
-                        tid = int(type_ids[t][n])
-                    else:
-                        tid = last_tid
-                        last_tid += 1
+                    tid = int(type_ids[t][n])
                     type_id_mapping[tn] = tid
                     type_name_mapping[str(tid)] = {"name": tn}
-                if not use_existing_ids:
-                    type_ids[t][n] = type_id_mapping[tn]
         return type_ids, type_name_mapping
 
     @staticmethod
     def get_type_names(
-        type_ids: np.ndarray, type_mapping: Dict[str, Any]
+        type_ids: np.ndarray, type_mapping: Dict[str, Any], n_agents: np.ndarray = None
     ) -> List[List[str]]:
         """
         Generate the type_names list from the type_ids array
+
+        Parameters
+        ----------
+        type_ids : np.ndarray (shape = [timesteps, agents])
+            The type ID for each agent at each timestep
+        type_mapping : Dict[str, Any]
+            Mapping from each type ID (as a string)
+            to a dict with the type's "name"
+        n_agents : np.ndarray (shape = [timesteps]) (optional)
+            The number of agents at each timestep, if provided
+            padding past the agents is named ""
+            Default: None (every agent is named)
         """
-        result = []
-        for t in range(type_ids.shape[0]):
-            result.append([])
-            for n in range(int(len(type_ids[t]))):
-                result[t].append(type_mapping[str(int(type_ids[t][n]))]["name"])
-        return result
+        if not np.issubdtype(type_ids.dtype, np.integer):
+            type_ids = type_ids.astype(np.int64)
+        if n_agents is None:
+            is_agent = np.ones(type_ids.shape, dtype=bool)
+        else:
+            is_agent = np.arange(type_ids.shape[1]) < np.asarray(n_agents)[:, None]
+        agent_type_ids = type_ids[is_agent]
+        if np.any(agent_type_ids < 0):
+            raise DataError(f"type IDs must be >= 0, got {np.amin(agent_type_ids)}")
+        # check the mapping's keys, then sort them to search for each used ID
+        mapped_ids = []
+        for type_id in type_mapping:
+            try:
+                mapped_id = int(type_id)
+            except ValueError:
+                raise DataError(f"typeMapping key {type_id!r} is not an integer")
+            if mapped_id < 0:
+                raise DataError(f"typeMapping keys must be >= 0, got {type_id!r}")
+            mapped_ids.append(mapped_id)
+        mapped_ids = np.array(mapped_ids, dtype=np.int64)
+        if np.unique(mapped_ids).size != mapped_ids.size:
+            raise DataError("typeMapping has more than one key for the same type ID")
+        order = np.argsort(mapped_ids)
+        sorted_ids = mapped_ids[order]
+        sorted_names = np.array(
+            [info["name"] for info in type_mapping.values()], dtype=object
+        )[order]
+        # look up each distinct type ID used by an agent once
+        used_ids, inverse = np.unique(agent_type_ids, return_inverse=True)
+        positions = np.searchsorted(sorted_ids, used_ids)
+        is_mapped = positions < sorted_ids.size
+        is_mapped[is_mapped] = sorted_ids[positions[is_mapped]] == used_ids[is_mapped]
+        if not np.all(is_mapped):
+            missing_ids = used_ids[~is_mapped]
+            raise DataError(f"type IDs {missing_ids.tolist()} are not in typeMapping")
+        result = np.full(type_ids.shape, "", dtype=object)
+        result[is_agent] = sorted_names[positions][inverse]
+        return result.tolist()
 
     @classmethod
-    def from_buffer_data(cls, buffer_data: Dict[str, Any]):
+    def from_buffer_data(
+        cls, buffer_data: Dict[str, Any], dtype: np.dtype = np.float64
+    ):
         """
         Create AgentData from a simularium JSON dict containing buffers
+
+        Parameters
+        ----------
+        buffer_data : Dict[str, Any]
+            A simularium JSON dict containing buffers
+        dtype : np.dtype (optional)
+            The float dtype used to store positions, rotations,
+            radii, and subpoints. Pass np.float32 to halve
+            the memory used by large trajectories
+            Default: np.float64
         """
         bundle_data = buffer_data["spatialData"]["bundleData"]
+        # convert all the frames' data to floats at once, then slice each frame
+        frame_starts = np.cumsum([0] + [len(frame["data"]) for frame in bundle_data])
+        all_frame_data = np.fromiter(
+            itertools.chain.from_iterable(frame["data"] for frame in bundle_data),
+            dtype=np.float64,
+            count=int(frame_starts[-1]),
+        )
+        frames = [
+            all_frame_data[frame_starts[t] : frame_starts[t + 1]]
+            for t in range(len(bundle_data))
+        ]
+        frame_layouts = [AgentData._scan_frame(frame_data) for frame_data in frames]
         total_steps, max_agents, max_subpoints = AgentData._get_buffer_data_dimensions(
-            buffer_data
+            frame_layouts
+        )
+        log.debug(
+            "original dim = %d timesteps X %d agents X %d subpoints",
+            total_steps,
+            max_agents,
+            max_subpoints,
         )
-        print(
-            f"original dim = {total_steps} timesteps X "
-            f"{max_agents} agents X {max_subpoints} subpoints"
+        # read the frame metadata as a column rather than frame by frame
+        times = np.fromiter(
+            (frame["time"] for frame in bundle_data),
+            dtype=np.float64,
+            count=total_steps,
         )
-        times = np.zeros(total_steps)
-        n_agents = np.zeros(total_steps)
-        viz_types = np.zeros((total_steps, max_agents))
-        unique_ids = np.zeros((total_steps, max_agents))
-        type_ids = np.zeros((total_steps, max_agents))
-        positions = np.zeros((total_steps, max_agents, 3))
-        rotations = np.zeros((total_steps, max_agents, 3))
-        radii = np.ones((total_steps, max_agents))
-        n_subpoints = np.zeros((total_steps, max_agents))
-        subpoints = np.zeros((total_steps, max_agents, max_subpoints, 3))
+        n_agents = np.zeros(total_steps, dtype=np.int32)
+        viz_types = np.zeros((total_steps, max_agents), dtype=np.int32)
+        # IDs can be large, int64 holds any ID a float64 buffer holds exactly
+        unique_ids = np.zeros((total_steps, max_agents), dtype=np.int64)
+        type_ids = np.zeros((total_steps, max_agents), dtype=np.int64)
+        positions = np.zeros((total_steps, max_agents, 3), dtype=dtype)
+        rotations = np.zeros((total_steps, max_agents, 3), dtype=dtype)
+        radii = np.ones((total_steps, max_agents), dtype=dtype)
+        n_subpoints = np.zeros((total_steps, max_agents), dtype=np.int32)
+        subpoints = []
         for t in range(total_steps):
-            times[t] = bundle_data[t]["time"]
-            frame_data = bundle_data[t]["data"]
-            n = 0
-            i = 0
-            while i + V1_SPATIAL_BUFFER_STRUCT.NSP_INDEX < len(frame_data):
-                # a new agent should start at this index
-                viz_types[t][n] = frame_data[
-                    i + V1_SPATIAL_BUFFER_STRUCT.VIZ_TYPE_INDEX
-                ]
-                unique_ids[t][n] = frame_data[i + V1_SPATIAL_BUFFER_STRUCT.UID_INDEX]
-                type_ids[t][n] = frame_data[i + V1_SPATIAL_BUFFER_STRUCT.TID_INDEX]
-                positions[t][n] = [
-                    frame_data[i + V1_SPATIAL_BUFFER_STRUCT.POSX_INDEX],
-                    frame_data[i + V1_SPATIAL_BUFFER_STRUCT.POSY_INDEX],
-                    frame_data[i + V1_SPATIAL_BUFFER_STRUCT.POSZ_INDEX],
-                ]
-                rotations[t][n] = [
-                    frame_data[i + V1_SPATIAL_BUFFER_STRUCT.ROTX_INDEX],
-                    frame_data[i + V1_SPATIAL_BUFFER_STRUCT.ROTY_INDEX],
-                    frame_data[i + V1_SPATIAL_BUFFER_STRUCT.ROTZ_INDEX],
-                ]
-                radii[t][n] = frame_data[i + V1_SPATIAL_BUFFER_STRUCT.R_INDEX]
-                i += V1_SPATIAL_BUFFER_STRUCT.NSP_INDEX
-                # get the subpoints
-                if max_subpoints < 1:
-                    i += int(
-                        V1_SPATIAL_BUFFER_STRUCT.SP_INDEX
-                        - V1_SPATIAL_BUFFER_STRUCT.NSP_INDEX
-                    )
-                    n += 1
-                    continue
-                n_subpoints[t][n] = int(frame_data[i] / 3.0)
-                p = 0
-                d = 0
-                for j in range(int(frame_data[i])):
-                    subpoints[t][n][p][d] = frame_data[i + 1 + j]
-                    d += 1
-                    if d > 2:
-                        d = 0
-                        p += 1
-                i += int(
-                    frame_data[i]
-                    + (
-                        V1_SPATIAL_BUFFER_STRUCT.SP_INDEX
-                        - V1_SPATIAL_BUFFER_STRUCT.NSP_INDEX
-                    )
-                )
-                n += 1
-            n_agents[t] = n
+            n_agents[t], frame_subpoints = AgentData._decode_frame(
+                frames[t],
+                frame_layouts[t],
+                viz_types[t],
+                unique_ids[t],
+                type_ids[t],
+                positions[t],
+                rotations[t],
+                radii[t],
+                n_subpoints[t],
+            )
+            subpoints.append(frame_subpoints)
         type_names = AgentData.get_type_names(
-            type_ids, buffer_data["trajectoryInfo"]["typeMapping"]
+            type_ids, buffer_data["trajectoryInfo"]["typeMapping"], n_agents
         )
-        return cls(
+        result = cls(
             times=times,
             n_agents=n_agents,
             viz_types=viz_types,
@@ -285,10 +489,16 @@ class AgentData:
             radii=radii,
             rotations=rotations,
             n_subpoints=n_subpoints,
-            subpoints=subpoints,
             draw_fiber_points=False,
             type_ids=type_ids,
         )
+        if subpoints:
+            packed_subpoints = np.concatenate(subpoints).astype(dtype, copy=False)
+        else:
+            # no frames
+            packed_subpoints = np.empty((0, 3), dtype=dtype)
+        result.set_packed_subpoints(packed_subpoints)
+        return result
 
     @classmethod
     def from_dataframe(cls, traj: pd.DataFrame):
@@ -301,44 +511,28 @@ class AgentData:
         n_agents = np.squeeze(
             traj.groupby("time").agg(["count"])["unique_id"].to_numpy()
         )
-        grouped_traj = (
-            traj.set_index(["time", traj.groupby("time").cumcount()])
-            .unstack(fill_value=0)
-            .stack()
-        )
-        unique_ids = np.array(
-            grouped_traj["unique_id"]
-            .groupby(level=0)
-            .apply(lambda x: x.values.tolist())
-            .tolist()
+        agent_index = ["time", traj.groupby("time").cumcount()]
+        grouped_traj = traj.set_index(agent_index).unstack(fill_value=0).stack()
+        total_steps = grouped_traj.index.get_level_values(0).nunique()
+        max_agents = len(grouped_traj) // total_steps
+        unique_ids = (
+            grouped_traj["unique_id"].to_numpy().reshape(total_steps, max_agents)
         )
-        positions = np.array(
+        positions = (
             grouped_traj[["positionX", "positionY", "positionZ"]]
-            .groupby(level=0)
-            .apply(lambda x: x.values.tolist())
-            .tolist()
+            .to_numpy()
+            .reshape(total_steps, max_agents, 3)
         )
-        rotations = np.array(
+        rotations = (
             grouped_traj[["rotationX", "rotationY", "rotationZ"]]
-            .groupby(level=0)
-            .apply(lambda x: x.values.tolist())
-            .tolist()
-        )
-        radii = np.array(
-            grouped_traj["radius"]
-            .groupby(level=0)
-            .apply(lambda x: x.values.tolist())
-            .tolist()
-        )
-        grouped_traj = (
-            traj.set_index(["time", traj.groupby("time").cumcount()])
-            .unstack(fill_value="")
-            .stack()
+            .to_numpy()
+            .reshape(total_steps, max_agents, 3)
         )
+        radii = grouped_traj["radius"].to_numpy().reshape(total_steps, max_agents)
         type_names = (
-            grouped_traj["type"]
-            .groupby(level=0)
-            .apply(lambda x: x.values.tolist())
+            traj.set_index(agent_index)["type"]
+            .unstack(fill_value="")
+            .to_numpy()
             .tolist()
         )
         return cls(
@@ -352,6 +546,36 @@ class AgentData:
             rotations=rotations,
         )
 
+    @staticmethod
+    def _merge_agents(
+        current: np.ndarray,
+        new: np.ndarray,
+        max_agents: int,
+        current_index: Tuple[np.ndarray, np.ndarray],
+        new_index: Tuple[np.ndarray, np.ndarray],
+        new_columns: np.ndarray,
+    ) -> np.ndarray:
+        """
+        Copy the current and new agents of a per-agent array
+        into one preallocated array, current agents keep their columns and
+        new agents are placed at new_columns in their timestep,
+        zero-padding any trailing dimensions (e.g. subpoints) that differ in size
+        """
+        trailing_shape = tuple(
+            max(c, n) for c, n in zip(current.shape[2:], new.shape[2:])
+        )
+        result = np.zeros(
+            (current.shape[0], max_agents) + trailing_shape,
+            dtype=np.result_type(current, new),
+        )
+        result[current_index + tuple(slice(0, d) for d in current.shape[2:])] = current[
+            current_index
+        ]
+        result[
+            (new_index[0], new_columns) + tuple(slice(0, d) for d in new.shape[2:])
+        ] = new[new_index]
+        return result
+
     def append_agents(self, new_agents: AgentData):
         """
         Concatenate the new AgentData with the current data,
@@ -367,19 +591,7 @@ class AgentData:
                 f"existing data has {total_steps}"
             )
         max_agents = int(np.amax(self.n_agents)) + int(np.amax(new_agents.n_agents))
-        # add agents
         n_agents = np.add(self.n_agents, new_agents.n_agents)
-        self.viz_types = np.concatenate((self.viz_types, new_agents.viz_types), axis=1)
-        unique_ids = np.zeros((total_steps, max_agents))
-        types = []
-        type_ids = np.zeros((total_steps, max_agents))
-        self.positions = np.concatenate((self.positions, new_agents.positions), axis=1)
-        self.rotations = np.concatenate((self.rotations, new_agents.rotations), axis=1)
-        self.radii = np.concatenate((self.radii, new_agents.radii), axis=1)
-        self.n_subpoints = np.concatenate(
-            (self.n_subpoints, new_agents.n_subpoints), axis=1
-        )
-        self.subpoints = np.concatenate((self.subpoints, new_agents.subpoints), axis=1)
         # generate new unique IDs and type IDs so they don't overlap
         if self.type_ids is None:
             self.type_ids, tm = AgentData.get_type_ids_and_mapping(self.types)
@@ -388,30 +600,62 @@ class AgentData:
                 new_agents.types
             )
         self.type_mapping = None
-        used_uids = list(np.unique(self.unique_ids))
-        new_uids = {}
-        for t in range(total_steps):
-            i = 0
-            types.append([])
-            n_a = int(self.n_agents[t])
-            for n in range(n_a):
-                unique_ids[t][i] = self.unique_ids[t][n]
-                type_ids[t][i] = self.type_ids[t][n]
-                types[t].append(self.types[t][n])
-                i += 1
-            n_a = int(new_agents.n_agents[t])
-            for n in range(n_a):
-                raw_uid = new_agents.unique_ids[t][n]
-                if raw_uid not in new_uids:
-                    uid = raw_uid
-                    while uid in used_uids:
-                        uid += 1
-                    new_uids[raw_uid] = uid
-                    used_uids.append(uid)
-                unique_ids[t][i] = new_uids[raw_uid]
-                type_ids[t][i] = new_agents.type_ids[t][n]
-                types[t].append(new_agents.types[t][n])
-                i += 1
+        n_current = self.n_agents.astype(int)
+        n_new = new_agents.n_agents.astype(int)
+        # arrays may be padded to different widths, so index only the agents
+        max_current = int(np.amax(n_current, initial=0))
+        max_new = int(np.amax(n_new, initial=0))
+        t_current, n_current_ix = np.nonzero(
+            np.arange(max_current) < n_current[:, np.newaxis]
+        )
+        t_new, n_new_ix = np.nonzero(np.arange(max_new) < n_new[:, np.newaxis])
+        current_index = (t_current, n_current_ix)
+        new_index = (t_new, n_new_ix)
+        # new agents are placed after the existing agents in each frame
+        new_columns = n_current[t_new] + n_new_ix
+        merge_args = (max_agents, current_index, new_index, new_columns)
+        # add agents
+        self.viz_types = AgentData._merge_agents(
+            self.viz_types, new_agents.viz_types, *merge_args
+        )
+        self.positions = AgentData._merge_agents(
+            self.positions, new_agents.positions, *merge_args
+        )
+        self.rotations = AgentData._merge_agents(
+            self.rotations, new_agents.rotations, *merge_args
+        )
+        self.radii = AgentData._merge_agents(self.radii, new_agents.radii, *merge_args)
+        self.n_subpoints = AgentData._merge_agents(
+            self.n_subpoints, new_agents.n_subpoints, *merge_args
+        )
+        self.subpoints = AgentData._merge_agents(
+            self.subpoints, new_agents.subpoints, *merge_args
+        )
+        type_ids = AgentData._merge_agents(
+            self.type_ids, new_agents.type_ids, *merge_args
+        )
+        # resolve each distinct new unique ID once, in order of first appearance
+        raw_uids, first_index, inverse = np.unique(
+            new_agents.unique_ids[new_index],
+            return_index=True,
+            return_inverse=True,
+        )
+        used_uids = set(np.unique(self.unique_ids).tolist())
+        resolved_uids = np.zeros_like(raw_uids)
+        for r in np.argsort(first_index):
+            uid = raw_uids[r].item()
+            while uid in used_uids:
+                uid += 1
+            resolved_uids[r] = uid
+            used_uids.add(uid)
+        unique_ids = AgentData._merge_agents(
+            self.unique_ids, new_agents.unique_ids, *merge_args
+        )
+        unique_ids[t_new, new_columns] = resolved_uids[inverse]
+        types = [
+            self.types[t][: n_current[t]] + new_agents.types[t][: n_new[t]]
+            for t in range(total_steps)
+        ]
         self.unique_ids = unique_ids
         self.types = types
         self.type_ids = type_ids
@@ -427,13 +671,16 @@ class AgentData:
             n_agents=np.copy(self.n_agents),
             viz_types=np.copy(self.viz_types),
             unique_ids=np.copy(self.unique_ids),
-            types=copy.deepcopy(self.types, memo),
+            types=[list(agent_types) for agent_types in self.types],
             positions=np.copy(self.positions),
             radii=np.copy(self.radii),
             rotations=np.copy(self.rotations),
             n_subpoints=np.copy(self.n_subpoints),
-            subpoints=np.copy(self.subpoints),
+            subpoints=None if self._subpoints is None else np.copy(self._subpoints),
             draw_fiber_points=self.draw_fiber_points,
             type_ids=type_ids,
         )
+        if self._packed_subpoints is not None:
+            packed_subpoints, packed_counts, _ = self._packed_subpoints
+            result.set_packed_subpoints(np.copy(packed_subpoints), packed_counts)
         return result
@@ -21,9 +21,9 @@ class CameraData:
 
     def __init__(
         self,
-        position: np.ndarray = np.array([0.0, 0.0, 120.0]),
-        look_at_position: np.ndarray = np.zeros(3),
-        up_vector: np.ndarray = np.array([0.0, 1.0, 0.0]),
+        position: np.ndarray = None,
+        look_at_position: np.ndarray = None,
+        up_vector: np.ndarray = None,
         fov_degrees: float = 50.0,
     ):
         """
@@ -47,63 +47,38 @@ class CameraData:
             that is seen from bottom to top of the camera view
             Default: 50.0
         """
-        self.position = position
-        self.look_at_position = look_at_position
-        self.up_vector = up_vector
+        self.position = (
+            position if position is not None else np.array([0.0, 0.0, 120.0])
+        )
+        self.look_at_position = (
+            look_at_position if look_at_position is not None else np.zeros(3)
+        )
+        self.up_vector = (
+            up_vector if up_vector is not None else np.array([0.0, 1.0, 0.0])
+        )
         self.fov_degrees = fov_degrees
 
     @classmethod
     def from_buffer_data(cls, buffer_data: Dict[str, Any]):
-        """ """
+        """
+        Create CameraData from a simularium JSON dict containing buffers
+        """
+        camera = buffer_data["trajectoryInfo"]["cameraDefault"]
+        position = camera["position"]
+        look_at_position = camera["lookAtPosition"]
+        up_vector = camera["upVector"]
         return cls(
             position=np.array(
-                [
-                    float(
-                        buffer_data["trajectoryInfo"]["cameraDefault"]["position"]["x"]
-                    ),
-                    float(
-                        buffer_data["trajectoryInfo"]["cameraDefault"]["position"]["y"]
-                    ),
-                    float(
-                        buffer_data["trajectoryInfo"]["cameraDefault"]["position"]["z"]
-                    ),
-                ]
+                [position["x"], position["y"], position["z"]], dtype=np.float64
             ),
             look_at_position=np.array(
-                [
-                    float(
-                        buffer_data["trajectoryInfo"]["cameraDefault"][
-                            "lookAtPosition"
-                        ]["x"]
-                    ),
-                    float(
-                        buffer_data["trajectoryInfo"]["cameraDefault"][
-                            "lookAtPosition"
-                        ]["y"]
-                    ),
-                    float(
-                        buffer_data["trajectoryInfo"]["cameraDefault"][
-                            "lookAtPosition"
-                        ]["z"]
-                    ),
-                ]
+                [look_at_position["x"], look_at_position["y"], look_at_position["z"]],
+                dtype=np.float64,
             ),
             up_vector=np.array(
-                [
-                    float(
-                        buffer_data["trajectoryInfo"]["cameraDefault"]["upVector"]["x"]
-                    ),
-                    float(
-                        buffer_data["trajectoryInfo"]["cameraDefault"]["upVector"]["y"]
-                    ),
-                    float(
-                        buffer_data["trajectoryInfo"]["cameraDefault"]["upVector"]["z"]
-                    ),
-                ]
-            ),
-            fov_degrees=float(
-                buffer_data["trajectoryInfo"]["cameraDefault"]["fovDegrees"]
+                [up_vector["x"], up_vector["y"], up_vector["z"]], dtype=np.float64
             ),
+            fov_degrees=float(camera["fovDegrees"]),
         )
 
     def __deepcopy__(self, memo):
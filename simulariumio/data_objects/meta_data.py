@@ -24,7 +24,7 @@ class MetaData:
     def __init__(
         self,
         box_size: np.ndarray,
-        camera_defaults: CameraData = CameraData(),
+        camera_defaults: CameraData = None,
         scale_factor: float = 1.0,
     ):
         """
@@ -50,7 +50,9 @@ class MetaData:
             Default: 1.0
         """
         self.box_size = box_size
-        self.camera_defaults = camera_defaults
+        self.camera_defaults = (
+            camera_defaults if camera_defaults is not None else CameraData()
+        )
         self.scale_factor = scale_factor
 
     @classmethod
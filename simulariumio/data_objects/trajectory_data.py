@@ -5,6 +5,8 @@ import copy
 import logging
 from typing import Any, Dict, List
 
+import numpy as np
+
 from .agent_data import AgentData
 from .unit_data import UnitData
 from .meta_data import MetaData
@@ -60,13 +62,24 @@ class TrajectoryData:
         self.plots = plots
 
     @classmethod
-    def from_buffer_data(cls, buffer_data: Dict[str, Any]):
+    def from_buffer_data(
+        cls, buffer_data: Dict[str, Any], dtype: np.dtype = np.float64
+    ):
         """
         Create TrajectoryData from a simularium JSON dict containing buffers
+
+        Parameters
+        ----------
+        buffer_data : Dict[str, Any]
+            A simularium JSON dict containing buffers
+        dtype : np.dtype (optional)
+            The float dtype used to store agents' positions, rotations,
+            radii, and subpoints
+            Default: np.float64
         """
         return cls(
             meta_data=MetaData.from_buffer_data(buffer_data),
-            agent_data=AgentData.from_buffer_data(buffer_data),
+            agent_data=AgentData.from_buffer_data(buffer_data, dtype=dtype),
             time_units=UnitData(
                 buffer_data["trajectoryInfo"]["timeUnits"]["name"],
                 float(buffer_data["trajectoryInfo"]["timeUnits"]["magnitude"]),
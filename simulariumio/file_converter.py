@@ -3,11 +3,19 @@
 
 import json
 import logging
+from pathlib import Path
 from typing import Any, Dict
 
+import numpy as np
+
 from .trajectory_converter import TrajectoryConverter
 from .data_objects import TrajectoryData, UnitData
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 ###############################################################################
 
 log = logging.getLogger(__name__)
@@ -15,10 +23,24 @@ log = logging.getLogger(__name__)
 ###############################################################################
 
 
+def _load_json(input_path: str) -> Dict[str, Any]:
+    """
+    Load a JSON file, using orjson to parse it if it's installed
+    """
+    contents = Path(input_path).read_bytes()
+    if orjson is not None:
+        try:
+            return orjson.loads(contents)
+        except orjson.JSONDecodeError:
+            # orjson is strict, e.g. it rejects NaN, so fall back to json
+            log.debug("orjson could not parse %s, using json", input_path)
+    return json.loads(contents)
+
+
 class FileConverter(TrajectoryConverter):
     current_trajectory_info_version: int = 2
 
-    def __init__(self, input_path: str):
+    def __init__(self, input_path: str, dtype: np.dtype = np.float64):
         """
         This object loads the data in .simularium JSON format
         at the input path
@@ -27,16 +49,20 @@ class FileConverter(TrajectoryConverter):
         ----------
         input_path: str
             path to the .simularium JSON file to load
+        dtype: np.dtype (optional)
+            float dtype used to store agents' positions, rotations,
+            radii, and subpoints. Pass np.float32 to halve
+            the memory used by large trajectories
+            Default: np.float64
         """
         print("Reading Simularium JSON -------------")
-        with open(input_path) as simularium_file:
-            buffer_data = json.load(simularium_file)
+        buffer_data = _load_json(input_path)
         if (
             int(buffer_data["trajectoryInfo"]["version"])
             < self.current_trajectory_info_version
         ):
             buffer_data = self.update_trajectory_info_version(buffer_data)
-        self._data = TrajectoryData.from_buffer_data(buffer_data)
+        self._data = TrajectoryData.from_buffer_data(buffer_data, dtype=dtype)
 
     def update_trajectory_info_version(self, data: Dict[str, Any]) -> Dict[str, Any]:
         """
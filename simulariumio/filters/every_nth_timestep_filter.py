@@ -2,7 +2,6 @@
 # -*- coding: utf-8 -*-
 
 import logging
-import math
 
 import numpy as np
 
@@ -42,52 +41,35 @@ class EveryNthTimestepFilter(Filter):
         print(f"Filtering: every {self.n}th timestep -------------")
         if self.n < 2:
             raise Exception("N < 2: no timesteps will be filtered")
-        # get filtered dimensions
-        total_steps = int(math.ceil(data.agent_data.times.size / float(self.n)))
-        max_agents = int(np.amax(data.agent_data.n_agents))
-        max_subpoints = int(np.amax(data.agent_data.n_subpoints))
-        # get filtered data
-        times = np.zeros(total_steps)
-        n_agents = np.zeros(total_steps)
-        viz_types = np.zeros((total_steps, max_agents))
-        unique_ids = np.zeros((total_steps, max_agents))
-        types = []
-        type_ids = np.zeros((total_steps, max_agents))
-        positions = np.zeros((total_steps, max_agents, 3))
-        radii = np.ones((total_steps, max_agents))
-        n_subpoints = np.zeros((total_steps, max_agents))
-        subpoints = np.zeros((total_steps, max_agents, max_subpoints, 3))
-        i = 0
-        for t in range(data.agent_data.times.size):
-            if t % self.n != 0:
-                continue
-            times[i] = data.agent_data.times[t]
-            n_agents[i] = int(data.agent_data.n_agents[t])
-            types.append([])
-            for n in range(int(n_agents[i])):
-                viz_types[i][n] = data.agent_data.viz_types[t][n]
-                unique_ids[i][n] = data.agent_data.unique_ids[t][n]
-                type_ids[i][n] = data.agent_data.type_ids[t][n]
-                types[i].append(data.agent_data.types[t][n])
-                positions[i][n] = data.agent_data.positions[t][n]
-                radii[i][n] = data.agent_data.radii[t][n]
-                n_subpoints[i][n] = data.agent_data.n_subpoints[t][n]
-                subpoints[i][n][
-                    : np.shape(data.agent_data.subpoints[t][n])[0]
-                ] = data.agent_data.subpoints[t][n]
-            i += 1
-        data.agent_data.times = times
-        data.agent_data.n_agents = n_agents
-        data.agent_data.viz_types = viz_types
-        data.agent_data.unique_ids = unique_ids
-        data.agent_data.types = types
-        data.agent_data.type_ids = type_ids
-        data.agent_data.positions = positions
-        data.agent_data.radii = radii
-        data.agent_data.n_subpoints = n_subpoints
-        data.agent_data.subpoints = subpoints
+        # keep every nth timestep, copying so the unfiltered arrays can be freed
+        agent_data = data.agent_data
+        max_agents = int(np.amax(agent_data.n_agents))
+        max_subpoints = int(np.amax(agent_data.n_subpoints))
+        packed_subpoints = agent_data.get_packed_subpoints()
+        if packed_subpoints is not None:
+            # keep the packed rows of the kept timesteps without unpacking them
+            packed_n_subpoints = agent_data.get_packed_n_subpoints()
+            frame_n_rows = np.sum(packed_n_subpoints, axis=1)
+            row_frames = np.repeat(np.arange(frame_n_rows.size), frame_n_rows)
+            packed_subpoints = packed_subpoints[row_frames % self.n == 0]
+            packed_n_subpoints = packed_n_subpoints[:: self.n]
+        else:
+            agent_data.subpoints = agent_data.subpoints[:: self.n].copy()
+        agent_data.times = agent_data.times[:: self.n].copy()
+        agent_data.n_agents = agent_data.n_agents[:: self.n].copy()
+        agent_data.viz_types = agent_data.viz_types[:: self.n].copy()
+        agent_data.unique_ids = agent_data.unique_ids[:: self.n].copy()
+        agent_data.types = agent_data.types[:: self.n]
+        if agent_data.type_ids is not None:
+            agent_data.type_ids = agent_data.type_ids[:: self.n].copy()
+        agent_data.positions = agent_data.positions[:: self.n].copy()
+        agent_data.rotations = agent_data.rotations[:: self.n].copy()
+        agent_data.radii = agent_data.radii[:: self.n].copy()
+        agent_data.n_subpoints = agent_data.n_subpoints[:: self.n].copy()
+        if packed_subpoints is not None:
+            agent_data.set_packed_subpoints(packed_subpoints, packed_n_subpoints)
         print(
-            f"filtered dims = {times.shape[0]} timesteps X "
+            f"filtered dims = {agent_data.times.shape[0]} timesteps X "
             f"{max_agents} agents X {max_subpoints} subpoints"
         )
         return data
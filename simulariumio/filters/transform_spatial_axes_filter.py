@@ -41,24 +41,29 @@ class TransformSpatialAxesFilter(Filter):
         for d in range(len(axes_mapping)):
             axes_mapping[d] = axes_mapping[d].lower()
         self.axes_mapping = axes_mapping
+        # the transform is a signed permutation, store it as the index
+        # of the input axis and the sign for each output axis
+        self._perm = np.zeros(3, dtype=np.intp)
+        self._signs = np.ones(3)
+        for d in range(len(axes_mapping)):
+            axis = axes_mapping[d]
+            axis_indices = [a for a in range(3) if "xyz"[a] in axis]
+            if len(axis_indices) != 1:
+                raise DataError(f"axes_mapping {axis} should contain one of x, y, z")
+            self._perm[d] = axis_indices[0]
+            if "-" in axis:
+                self._signs[d] = -1.0
+        self._reflects = bool(np.any(self._signs < 0))
 
-    def _transform_coordinate(
-        self, position: np.ndarray, set_direction: bool = True
-    ) -> np.ndarray:
+    def _transform_coordinates(self, coordinates: np.ndarray) -> np.ndarray:
         """
-        Transform an +X+Y+Z coordinate according to axes_mapping
+        Transform +X+Y+Z coordinates (in the last dimension)
+        according to axes_mapping
         """
-        result = np.zeros_like(position)
-        for d in range(len(self.axes_mapping)):
-            axis = self.axes_mapping[d]
-            if "x" in axis:
-                result[d] = position[0]
-            if "y" in axis:
-                result[d] = position[1]
-            if "z" in axis:
-                result[d] = position[2]
-            if set_direction and "-" in axis:
-                result[d] *= -1.0
+        result = coordinates[..., self._perm]
+        if self._reflects:
+            # not in place, so integer coordinates are promoted to float
+            result = result * self._signs
         return result
 
     def apply(self, data: TrajectoryData) -> TrajectoryData:
@@ -66,26 +71,27 @@ class TransformSpatialAxesFilter(Filter):
         Transform spatial coordinates to rotate and/or reflect the scene
         """
         print(f"Filtering: transform spatial axes {self.axes_mapping} -------------")
-        # box size
-        box_size = self._transform_coordinate(data.meta_data.box_size, False)
-        # get dimensions
-        total_steps = data.agent_data.times.size
-        max_agents = int(np.amax(data.agent_data.n_agents))
-        max_subpoints = int(np.amax(data.agent_data.n_subpoints))
-        # get filtered data
-        positions = np.zeros((total_steps, max_agents, 3))
-        subpoints = np.zeros((total_steps, max_agents, max_subpoints, 3))
-        for t in range(total_steps):
-            for n in range(int(data.agent_data.n_agents[t])):
-                positions[t][n] = self._transform_coordinate(
-                    data.agent_data.positions[t][n]
-                )
-                if data.agent_data.n_subpoints[t][n] > 0:
-                    for s in range(int(data.agent_data.n_subpoints[t][n])):
-                        subpoints[t][n][s] = self._transform_coordinate(
-                            data.agent_data.subpoints[t][n][s]
-                        )
+        # box size is permuted but not reflected
+        box_size = data.meta_data.box_size[self._perm]
+        # transform every frame at once
+        positions = self._transform_coordinates(data.agent_data.positions)
         data.meta_data.box_size = box_size
         data.agent_data.positions = positions
+        packed_subpoints = data.agent_data.get_packed_subpoints()
+        if packed_subpoints is not None:
+            # transform only the subpoints that exist, without unpacking them
+            data.agent_data.set_packed_subpoints(
+                self._transform_coordinates(packed_subpoints),
+                data.agent_data.get_packed_n_subpoints(),
+            )
+            return data
+        max_subpoints = int(np.amax(data.agent_data.n_subpoints))
+        if max_subpoints > 0:
+            # padding is zero so it stays zero
+            subpoints = self._transform_coordinates(
+                data.agent_data.subpoints[:, :, :max_subpoints]
+            )
+        else:
+            subpoints = np.zeros(data.agent_data.n_subpoints.shape + (0, 3))
         data.agent_data.subpoints = subpoints
         return data
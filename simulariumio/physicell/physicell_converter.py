@@ -118,32 +118,48 @@ class PhysicellConverter(TrajectoryConverter):
         )
         result.type_ids = np.zeros((totalSteps, max_agents))
         # get data
+        scale_factor = input_data.meta_data.scale_factor
         for t in range(totalSteps):
-            n_agents = int(len(discrete_cells[t]["position_x"]))
+            cells = discrete_cells[t]
+            n_agents = int(len(cells["position_x"]))
             result.n_agents[t] = n_agents
-            i = 0
-            for n in range(n_agents):
-                result.unique_ids[t][i] = i
-                tid = self._get_agent_type(
-                    cell_type=int(discrete_cells[t]["cell_type"][n]),
-                    cell_phase=int(discrete_cells[t]["current_phase"][n]),
+            result.unique_ids[t][:n_agents] = np.arange(n_agents)
+            # look up each distinct type and phase once,
+            # in order of first appearance to keep type IDs stable
+            cell_types_and_phases = np.stack(
+                [
+                    cells["cell_type"].to_numpy().astype(int),
+                    cells["current_phase"].to_numpy().astype(int),
+                ],
+                axis=1,
+            )
+            unique_types_and_phases, first_index, inverse = np.unique(
+                cell_types_and_phases,
+                axis=0,
+                return_index=True,
+                return_inverse=True,
+            )
+            unique_tids = np.zeros(len(unique_types_and_phases), dtype=int)
+            for u in np.argsort(first_index):
+                unique_tids[u] = self._get_agent_type(
+                    cell_type=int(unique_types_and_phases[u][0]),
+                    cell_phase=int(unique_types_and_phases[u][1]),
                     type_names=input_data.types,
                 )
-                result.type_ids[t][i] = tid
-                while i >= len(result.types[t]):
-                    result.types[t].append("")
-                result.types[t][i] = self._type_mapping[tid]
-                result.positions[t][i] = input_data.meta_data.scale_factor * np.array(
-                    [
-                        discrete_cells[t]["position_x"][n],
-                        discrete_cells[t]["position_y"][n],
-                        discrete_cells[t]["position_z"][n],
-                    ]
-                )
-                result.radii[t][i] = input_data.meta_data.scale_factor * np.cbrt(
-                    3.0 / 4.0 * discrete_cells[t]["total_volume"][n] / np.pi
-                )
-                i += 1
+            tids = unique_tids[inverse.reshape(-1)]
+            result.type_ids[t][:n_agents] = tids
+            result.types[t] = [self._type_mapping[tid] for tid in tids.tolist()]
+            result.positions[t][:n_agents] = scale_factor * np.stack(
+                [
+                    cells["position_x"].to_numpy(),
+                    cells["position_y"].to_numpy(),
+                    cells["position_z"].to_numpy(),
+                ],
+                axis=1,
+            )
+            result.radii[t][:n_agents] = scale_factor * np.cbrt(
+                3.0 / 4.0 * cells["total_volume"].to_numpy() / np.pi
+            )
         spatial_units = UnitData(
             physicell_data[0].data["metadata"]["spatial_units"],
             1.0 / input_data.meta_data.scale_factor,
@@ -4,6 +4,8 @@
 import logging
 from typing import Dict, Any
 
+import numpy as np
+
 from ..exceptions import DataError
 from .plot_reader import PlotReader
 
@@ -28,19 +30,34 @@ class ScatterPlotReader(PlotReader):
             "yaxis": {"title": data.yaxis_title},
         }
         # plot data
-        simularium_data["data"] = []
-        for ytrace_name in data.ytraces:
-            if len(data.ytraces[ytrace_name]) != len(data.xtrace):
-                raise DataError(
-                    f"y-trace {ytrace_name} has a different length than x-trace"
-                )
-            simularium_data["data"].append(
-                {
-                    "name": ytrace_name,
-                    "type": "scatter",
-                    "x": data.xtrace.tolist(),
-                    "y": data.ytraces[ytrace_name].tolist(),
-                    "mode": data.render_mode,
-                }
+        x_length = len(data.xtrace)
+        bad_ytraces = [
+            ytrace_name
+            for ytrace_name, ytrace in data.ytraces.items()
+            if len(ytrace) != x_length
+        ]
+        if bad_ytraces:
+            raise DataError(
+                f"y-trace(s) {', '.join(bad_ytraces)} "
+                "have a different length than x-trace"
             )
+        x_values = data.xtrace.tolist()
+        render_mode = data.render_mode
+        ytrace_names = list(data.ytraces.keys())
+        ytraces = [np.asarray(data.ytraces[name]) for name in ytrace_names]
+        if len({ytrace.dtype for ytrace in ytraces}) == 1:
+            # traces share length and dtype, so convert them together
+            y_values = np.stack(ytraces).tolist()
+        else:
+            y_values = [ytrace.tolist() for ytrace in ytraces]
+        simularium_data["data"] = [
+            {
+                "name": ytrace_name,
+                "type": "scatter",
+                "x": x_values,
+                "y": y,
+                "mode": render_mode,
+            }
+            for ytrace_name, y in zip(ytrace_names, y_values)
+        ]
         return simularium_data
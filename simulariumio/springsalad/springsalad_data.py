@@ -24,7 +24,7 @@ class SpringsaladData:
         self,
         path_to_sim_view_txt: str,
         display_names: Dict[str, str] = {},
-        camera_defaults: CameraData = CameraData(),
+        camera_defaults: CameraData = None,
         scale_factor: float = 1.0,
         plots: List[Dict[str, Any]] = [],
     ):
@@ -61,6 +61,8 @@ class SpringsaladData:
         """
         self.path_to_sim_view_txt = path_to_sim_view_txt
         self.display_names = display_names
-        self.camera_defaults = camera_defaults
+        self.camera_defaults = (
+            camera_defaults if camera_defaults is not None else CameraData()
+        )
         self.scale_factor = scale_factor
         self.plots = plots
@@ -1,9 +1,12 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 
-from typing import Dict, Any
+import copy
+from functools import lru_cache
+from typing import Dict, Any, List, Tuple
 
 import numpy as np
+import pytest
 
 from simulariumio import AgentData, TrajectoryData, UnitData, MetaData, ScatterPlotData
 
@@ -122,3 +125,87 @@ def test_scatter_plot() -> Dict[str, Any]:
         },
         render_mode="lines",
     )
+
+
+@pytest.fixture(scope="session")
+def converter_cache():
+    """
+    Build each converter once per session and give each test
+    its own deep copy, so tests can't affect each other
+
+    Call with the converter class, its input,
+    and a hashable key for the input (default: the input itself)
+    """
+    converters = {}
+
+    def _get(converter_class, input_data, key=None):
+        if key is None:
+            key = input_data
+        if key not in converters:
+            converters[key] = converter_class(input_data)
+        return copy.deepcopy(converters[key])
+
+    return _get
+
+
+@lru_cache(maxsize=None)
+def _load_frame_data(path: str) -> Tuple[np.ndarray, ...]:
+    with np.load(path) as frame_data:
+        return tuple(frame_data[f"frame_{i}"] for i in range(len(frame_data.files)))
+
+
+def _without_key(data: Dict[str, Any], key: str) -> Dict[str, Any]:
+    return {k: v for k, v in data.items() if k != key}
+
+
+def _assert_metadata_equal(
+    expected_data: Dict[str, Any], buffer_data: Dict[str, Any]
+) -> List[Tuple[Dict[str, Any], Dict[str, Any]]]:
+    """
+    Assert everything but the frames' data buffers is equal,
+    return the pairs of expected and actual frames
+    """
+    assert _without_key(expected_data, "spatialData") == _without_key(
+        buffer_data, "spatialData"
+    )
+    expected_spatial_data = expected_data["spatialData"]
+    spatial_data = buffer_data["spatialData"]
+    assert _without_key(expected_spatial_data, "bundleData") == _without_key(
+        spatial_data, "bundleData"
+    )
+    expected_frames = expected_spatial_data["bundleData"]
+    frames = spatial_data["bundleData"]
+    assert len(expected_frames) == len(frames)
+    for expected_frame, frame in zip(expected_frames, frames):
+        assert _without_key(expected_frame, "data") == _without_key(frame, "data")
+    return list(zip(expected_frames, frames))
+
+
+def assert_buffer_equal(expected_data: Dict[str, Any], buffer_data: Dict[str, Any]):
+    """
+    Assert simularium data equals the expected data,
+    comparing each frame's data buffer as an array
+    """
+    for expected_frame, frame in _assert_metadata_equal(expected_data, buffer_data):
+        assert np.array_equal(
+            np.asarray(expected_frame["data"], dtype=np.float64),
+            np.asarray(frame["data"], dtype=np.float64),
+        )
+
+
+def assert_buffer_data_close(
+    expected_data: Dict[str, Any],
+    expected_frame_data_path: str,
+    buffer_data: Dict[str, Any],
+    rtol: float = 1e-12,
+):
+    """
+    Assert simularium data matches the expected data. Metadata is compared
+    exactly, and the data buffer for each frame is compared within a relative
+    tolerance to the one loaded from the .npz golden file at the given path
+    """
+    frames = _assert_metadata_equal(expected_data, buffer_data)
+    expected_frame_data = _load_frame_data(expected_frame_data_path)
+    assert len(frames) == len(expected_frame_data)
+    for (_, frame), frame_data in zip(frames, expected_frame_data):
+        np.testing.assert_allclose(np.asarray(frame["data"]), frame_data, rtol=rtol)
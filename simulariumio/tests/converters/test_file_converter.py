@@ -0,0 +1,43 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import math
+
+import numpy as np
+import pytest
+
+from simulariumio import FileConverter, file_converter
+
+
+@pytest.mark.parametrize(
+    "use_orjson",
+    [
+        True,
+        False,
+    ],
+)
+def test_load_json_with_nan(tmp_path, monkeypatch, use_orjson):
+    if use_orjson:
+        # orjson rejects NaN, so this checks the fallback to json
+        pytest.importorskip("orjson")
+    else:
+        monkeypatch.setattr(file_converter, "orjson", None)
+    path = tmp_path / "nan.simularium"
+    path.write_text('{"size": 1.5, "value": NaN}')
+    data = file_converter._load_json(str(path))
+    assert data["size"] == 1.5
+    assert math.isnan(data["value"])
+
+
+def test_file_converter_float32():
+    input_path = (
+        "simulariumio/tests/data/cytosim/aster_pull3D_couples_actin_solid_3_frames"
+        "/aster_pull3D_couples_actin_solid_3_frames.json"
+    )
+    agent_data = FileConverter(input_path, dtype=np.float32)._data.agent_data
+    expected = FileConverter(input_path)._data.agent_data
+    for name in ["positions", "rotations", "radii"]:
+        assert getattr(agent_data, name).dtype == np.float32
+        assert getattr(expected, name).dtype == np.float64
+    assert agent_data.get_packed_subpoints().dtype == np.float32
+    np.testing.assert_allclose(agent_data.positions, expected.positions, rtol=1e-6)
@@ -6,21 +6,45 @@ import pytest
 
 from simulariumio.physicell import PhysicellConverter, PhysicellData
 from simulariumio import MetaData
+from simulariumio.tests.conftest import assert_buffer_data_close
+
+# shared by the test cases, read-only so a converter can't modify it in place
+_BOX_1000 = np.array([1000.0, 1000.0, 100.0])
+_BOX_1000.flags.writeable = False
+
+
+def _build_trajectory(trajectory_name: str):
+    """
+    Build the input data for a test case when the test runs,
+    rather than when the tests are collected
+    """
+    if trajectory_name == "3_cells_3_frames":
+        return PhysicellData(
+            meta_data=MetaData(
+                box_size=_BOX_1000,
+                scale_factor=0.01,
+            ),
+            timestep=360.0,
+            path_to_output_dir="simulariumio/tests/data/physicell/output/",
+        )
+    if trajectory_name == "incorrect_path_to_output_dir":
+        return {
+            "meta_data": MetaData(
+                box_size=_BOX_1000,
+                scale_factor=0.01,
+            ),
+            "timestep": 360.0,
+            "path_to_output_dir": "../simulariumio/tests/data/physicell/",
+        }
+    raise ValueError(f"unknown trajectory {trajectory_name}")
 
 
 @pytest.mark.parametrize(
-    "trajectory, expected_data",
+    "trajectory_name, expected_data, expected_frame_data_path",
     [
         # 3 cells 3 frames
         (
-            PhysicellData(
-                meta_data=MetaData(
-                    box_size=np.array([1000.0, 1000.0, 100.0]),
-                    scale_factor=0.01,
-                ),
-                timestep=360.0,
-                path_to_output_dir="simulariumio/tests/data/physicell/output/",
-            ),
+            "3_cells_3_frames",
             {
                 "trajectoryInfo": {
                     "version": 2,
@@ -55,142 +79,36 @@ from simulariumio import MetaData
                         {
                             "frameNumber": 0,
                             "time": 0.0,
-                            "data": [
-                                1000.0,
-                                0.0,
-                                0.0,
-                                -4.2700000000000005,
-                                -2.5100000000000002,
-                                0.0,
-                                0.0,
-                                0.0,
-                                0.0,
-                                0.08412710547954229,
-                                0.0,
-                                1000.0,
-                                1.0,
-                                1.0,
-                                -2.2800000000000002,
-                                4.3,
-                                0.0,
-                                0.0,
-                                0.0,
-                                0.0,
-                                0.08412710547954229,
-                                0.0,
-                                1000.0,
-                                2.0,
-                                1.0,
-                                4.23,
-                                3.7800000000000002,
-                                0.0,
-                                0.0,
-                                0.0,
-                                0.0,
-                                0.08412710547954229,
-                                0.0,
-                            ],
                         },
                         {
                             "frameNumber": 1,
                             "time": 360.0,
-                            "data": [
-                                1000.0,
-                                0.0,
-                                0.0,
-                                -4.247925822013689,
-                                -2.386576945662163,
-                                0.0,
-                                0.0,
-                                0.0,
-                                0.0,
-                                0.08412710547954229,
-                                0.0,
-                                1000.0,
-                                1.0,
-                                1.0,
-                                -2.2800000000000002,
-                                4.3,
-                                0.0,
-                                0.0,
-                                0.0,
-                                0.0,
-                                0.08412710547954229,
-                                0.0,
-                                1000.0,
-                                2.0,
-                                1.0,
-                                4.23,
-                                3.7800000000000002,
-                                0.0,
-                                0.0,
-                                0.0,
-                                0.0,
-                                0.08412710547954229,
-                                0.0,
-                            ],
                         },
                         {
                             "frameNumber": 2,
                             "time": 720.0,
-                            "data": [
-                                1000.0,
-                                0.0,
-                                0.0,
-                                -3.993800168730208,
-                                -2.5387508185531873,
-                                0.0,
-                                0.0,
-                                0.0,
-                                0.0,
-                                0.08412710547954229,
-                                0.0,
-                                1000.0,
-                                1.0,
-                                1.0,
-                                -2.2800000000000002,
-                                4.3,
-                                0.0,
-                                0.0,
-                                0.0,
-                                0.0,
-                                0.08412710547954229,
-                                0.0,
-                                1000.0,
-                                2.0,
-                                1.0,
-                                4.23,
-                                3.7800000000000002,
-                                0.0,
-                                0.0,
-                                0.0,
-                                0.0,
-                                0.08412710547954229,
-                                0.0,
-                            ],
                         },
                     ],
                 },
                 "plotData": {"version": 1, "data": []},
             },
+            "simulariumio/tests/data/physicell/expected_bundle_data.npz",
         ),
         pytest.param(
-            {
-                "meta_data": MetaData(
-                    box_size=np.array([1000.0, 1000.0, 100.0]),
-                    scale_factor=0.01,
-                ),
-                "timestep": 360.0,
-                "path_to_output_dir": "../simulariumio/tests/data/physicell/",
-            },
+            "incorrect_path_to_output_dir",
             {},
+            "",
             marks=pytest.mark.raises(exception=AttributeError),
             # path_to_output_dir is incorrect
         ),
     ],
 )
-def test_physicell_converter(trajectory, expected_data):
-    converter = PhysicellConverter(trajectory)
+def test_physicell_converter(
+    converter_cache, trajectory_name, expected_data, expected_frame_data_path
+):
+    converter = converter_cache(
+        PhysicellConverter, _build_trajectory(trajectory_name), key=trajectory_name
+    )
     buffer_data = converter._read_trajectory_data(converter._data)
-    assert expected_data == buffer_data
+    assert_buffer_data_close(expected_data, expected_frame_data_path, buffer_data)
     assert converter._check_agent_ids_are_unique_per_frame(buffer_data)
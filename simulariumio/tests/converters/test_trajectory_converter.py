@@ -1133,3 +1133,79 @@ def test_trajectory_reader(trajectory, expected_data):
     buffer_data = converter._read_trajectory_data(converter._data)
     assert expected_data == buffer_data
     assert converter._check_agent_ids_are_unique_per_frame(buffer_data)
+
+
+def test_spatial_bundle_data_no_subpoints():
+    agent_data = three_default_agents().agent_data
+    # fewer agents in the second frame
+    agent_data.n_agents = np.array([3, 2, 3])
+    agent_data.type_ids, _ = AgentData.get_type_ids_and_mapping(agent_data.types)
+    bundle_data = TrajectoryConverter._get_spatial_bundle_data_no_subpoints(agent_data)
+    assert bundle_data[1] == {
+        "frameNumber": 1,
+        "time": 0.5,
+        "data": [
+            1000.0,
+            0.0,
+            1.0,
+            -43.37181102,
+            -13.41127423,
+            -17.31316927,
+            -17.31316927,
+            -13.41127423,
+            -43.37181102,
+            5.26366739,
+            0.0,
+            1000.0,
+            1.0,
+            2.0,
+            9.62132397,
+            13.4774314,
+            -20.30846039,
+            -20.30846039,
+            13.4774314,
+            9.62132397,
+            6.6920978,
+            0.0,
+        ],
+    }
+    # matches the buffers written by the subpoints path for agents without any
+    assert bundle_data == TrajectoryConverter._get_spatial_bundle_data_subpoints(
+        agent_data
+    )
+
+
+# a fiber with 2 subpoints, then 2 default agents with the given unique IDs
+def _fiber_and_spheres(uid_a, uid_b):
+    return (
+        [1001.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 1.0, 6.0]
+        + [1.0, 2.0, 3.0, 4.0, 5.0, 6.0]
+        + [1000.0, uid_a, 0.0, 7.0, 8.0, 9.0, 0.0, 0.0, 0.0, 2.0, 0.0]
+        + [1000.0, uid_b, 0.0, 7.0, 8.0, 9.0, 0.0, 0.0, 0.0, 2.0, 0.0]
+    )
+
+
+@pytest.mark.parametrize(
+    "frames",
+    [
+        [_fiber_and_spheres(5.0, 6.0), _fiber_and_spheres(6.0, 5.0)],
+        pytest.param(
+            [_fiber_and_spheres(5.0, 6.0), _fiber_and_spheres(5.0, 5.0)],
+            marks=pytest.mark.raises(
+                exception=Exception,
+                message="found duplicate ID 5.0 in frame 1 at index 29",
+            ),
+            # the second default agent's ID is at index 17 + 11 + 1
+        ),
+    ],
+)
+def test_check_agent_ids_are_unique_per_frame(frames):
+    buffer_data = {
+        "spatialData": {
+            "bundleData": [
+                {"frameNumber": t, "time": float(t), "data": data}
+                for t, data in enumerate(frames)
+            ]
+        }
+    }
+    assert TrajectoryConverter._check_agent_ids_are_unique_per_frame(buffer_data)
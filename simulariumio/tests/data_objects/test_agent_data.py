@@ -0,0 +1,240 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import copy
+
+import numpy as np
+import pytest
+
+from simulariumio import AgentData, TrajectoryConverter
+from simulariumio.exceptions import DataError
+
+
+@pytest.mark.parametrize(
+    "type_ids, type_mapping, n_agents, expected_names",
+    [
+        (
+            np.array([[0, 1], [1, 0]]),
+            {"0": {"name": "A"}, "1": {"name": "B"}},
+            None,
+            [["A", "B"], ["B", "A"]],
+        ),
+        # padding past n_agents is not looked up
+        (
+            np.array([[3, 0], [3, 3]]),
+            {"3": {"name": "C"}},
+            np.array([1, 2]),
+            [["C", ""], ["C", "C"]],
+        ),
+        pytest.param(
+            np.array([[0, -1]]),
+            {"0": {"name": "A"}, "1": {"name": "B"}},
+            None,
+            [],
+            marks=pytest.mark.raises(exception=DataError),
+            # negative type ID
+        ),
+        pytest.param(
+            np.array([[0, 2]]),
+            {"0": {"name": "A"}, "1": {"name": "B"}},
+            None,
+            [],
+            marks=pytest.mark.raises(exception=DataError),
+            # type ID missing from mapping
+        ),
+        # unused large mapping keys don't size the lookup
+        (
+            np.array([[5, 0]]),
+            {"5": {"name": "A"}, "0": {"name": "B"}, "3000000000": {"name": "C"}},
+            None,
+            [["A", "B"]],
+        ),
+        pytest.param(
+            np.array([[0]]),
+            {"-1": {"name": "X"}, "0": {"name": "A"}},
+            None,
+            [],
+            marks=pytest.mark.raises(exception=DataError),
+            # negative mapping key
+        ),
+        pytest.param(
+            np.array([[0]]),
+            {"0": {"name": "A"}, "A": {"name": "B"}},
+            None,
+            [],
+            marks=pytest.mark.raises(exception=DataError),
+            # non-integer mapping key
+        ),
+    ],
+)
+def test_get_type_names(type_ids, type_mapping, n_agents, expected_names):
+    assert AgentData.get_type_names(type_ids, type_mapping, n_agents) == expected_names
+
+
+def _agent_data(n_agents, types, width):
+    """
+    Create default AgentData for the given agents,
+    with arrays padded to the given number of agents
+    """
+    total_steps = len(n_agents)
+    unique_ids = np.zeros((total_steps, width))
+    for t in range(total_steps):
+        unique_ids[t][: n_agents[t]] = np.arange(n_agents[t])
+    return AgentData(
+        times=np.arange(total_steps, dtype=float),
+        n_agents=np.array(n_agents),
+        viz_types=1000.0 * np.ones((total_steps, width)),
+        unique_ids=unique_ids,
+        types=types,
+        positions=np.zeros((total_steps, width, 3)),
+        radii=np.ones((total_steps, width)),
+    )
+
+
+def test_append_agents_padded():
+    # arrays are padded wider than the types lists
+    agent_data = _agent_data([1, 2], [["A"], ["A", "B"]], width=4)
+    agent_data.radii[:, :2] = [[1.0, 0.0], [1.0, 2.0]]
+    new_agents = _agent_data([1, 1], [["C"], ["C"]], width=3)
+    new_agents.positions[:, 0, 0] = 100.0
+    new_agents.radii[:, 0] = 5.0
+    agent_data.append_agents(new_agents)
+    assert agent_data.n_agents.tolist() == [2, 3]
+    assert agent_data.unique_ids.tolist() == [[0, 2, 0], [0, 1, 2]]
+    assert agent_data.type_ids.tolist() == [[0, 0, 0], [0, 1, 0]]
+    assert agent_data.types == [["A", "C"], ["A", "B", "C"]]
+    # every per-agent array is in the same columns as the IDs
+    for name in ["viz_types", "radii", "n_subpoints"]:
+        assert getattr(agent_data, name).shape == (2, 3)
+    assert agent_data.positions.shape == (2, 3, 3)
+    assert agent_data.positions[:, :, 0].tolist() == [[0, 100, 0], [0, 0, 100]]
+    assert agent_data.radii.tolist() == [[1, 5, 0], [1, 2, 5]]
+
+
+def test_append_agents_different_max_subpoints():
+    agent_data = _agent_data([1], [["A"]], width=1)
+    agent_data.n_subpoints = np.array([[2]])
+    agent_data.subpoints = np.arange(6, dtype=float).reshape((1, 1, 2, 3))
+    new_agents = _agent_data([1], [["B"]], width=1)
+    new_agents.n_subpoints = np.array([[3]])
+    new_agents.subpoints = 10.0 + np.arange(9, dtype=float).reshape((1, 1, 3, 3))
+    agent_data.append_agents(new_agents)
+    assert agent_data.subpoints.shape == (1, 2, 3, 3)
+    assert agent_data.n_subpoints.tolist() == [[2, 3]]
+    # the agent with fewer subpoints is zero-padded
+    assert agent_data.subpoints[0, 0].tolist() == [
+        [0.0, 1.0, 2.0],
+        [3.0, 4.0, 5.0],
+        [0.0, 0.0, 0.0],
+    ]
+    assert agent_data.subpoints[0, 1].tolist() == new_agents.subpoints[0, 0].tolist()
+
+
+def _buffer_data(frames):
+    return {
+        "trajectoryInfo": {"typeMapping": {"0": {"name": "A"}, "1": {"name": "B"}}},
+        "spatialData": {
+            "bundleData": [
+                {"frameNumber": t, "time": float(t), "data": data}
+                for t, data in enumerate(frames)
+            ]
+        },
+    }
+
+
+# a fiber with 2 subpoints followed by a default agent
+FIBER_AND_SPHERE = (
+    [1001.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 1.0, 6.0]
+    + [1.0, 2.0, 3.0, 4.0, 5.0, 6.0]
+    + [1000.0, 1.0, 1.0, 7.0, 8.0, 9.0, 0.0, 0.0, 0.0, 2.0, 0.0]
+)
+# a default agent only
+SPHERE = [1000.0, 1.0, 1.0, 7.0, 8.0, 9.0, 0.0, 0.0, 0.0, 2.0, 0.0]
+
+
+def test_from_buffer_data_empty():
+    agent_data = AgentData.from_buffer_data(_buffer_data([]))
+    assert agent_data.times.size == 0
+    assert agent_data.positions.shape == (0, 0, 3)
+    assert agent_data.subpoints.shape == (0, 0, 0, 3)
+    assert agent_data.types == []
+
+
+def test_packed_subpoints():
+    agent_data = AgentData.from_buffer_data(_buffer_data([FIBER_AND_SPHERE, SPHERE]))
+    assert agent_data.has_subpoints
+    assert agent_data.get_packed_subpoints().tolist() == [
+        [1.0, 2.0, 3.0],
+        [4.0, 5.0, 6.0],
+    ]
+    # getting one agent's subpoints doesn't unpack them
+    assert agent_data.get_subpoints(0, 0).tolist() == [[1.0, 2.0, 3.0], [4.0, 5.0, 6.0]]
+    assert agent_data.get_subpoints(0, 1).shape == (0, 3)
+    assert agent_data.get_subpoints(1, 0).shape == (0, 3)
+    assert agent_data.get_packed_subpoints() is not None
+    # the dense array is zero-padded
+    assert agent_data.subpoints.shape == (2, 2, 2, 3)
+    assert agent_data.subpoints[0, 0].tolist() == [[1.0, 2.0, 3.0], [4.0, 5.0, 6.0]]
+    assert not np.any(agent_data.subpoints[0, 1])
+    assert not np.any(agent_data.subpoints[1])
+    assert agent_data.get_packed_subpoints() is None
+    assert agent_data.get_subpoints(0, 0).tolist() == [[1.0, 2.0, 3.0], [4.0, 5.0, 6.0]]
+
+
+def test_set_packed_subpoints():
+    agent_data = _agent_data([2, 1], [["A", "B"], ["A"]], width=2)
+    agent_data.n_subpoints = np.array([[1, 2], [1, 0]])
+    agent_data.set_packed_subpoints(np.arange(12, dtype=float).reshape((4, 3)))
+    assert agent_data.get_subpoints(0, 1).tolist() == [[3, 4, 5], [6, 7, 8]]
+    assert agent_data.get_subpoints(1, 0).tolist() == [[9, 10, 11]]
+    assert agent_data.subpoints[0, 0].tolist() == [[0, 1, 2], [0, 0, 0]]
+
+
+def test_edit_n_subpoints_packed():
+    buffer_data = _buffer_data([FIBER_AND_SPHERE, SPHERE])
+    packed = AgentData.from_buffer_data(buffer_data)
+    dense = AgentData.from_buffer_data(buffer_data)
+    dense.subpoints
+    for agent_data in [packed, dense]:
+        agent_data.n_subpoints[0, 0] = 1
+    copied = copy.deepcopy(packed)
+    assert packed.get_packed_subpoints() is not None
+    assert copied.get_packed_subpoints() is not None
+    assert dense.get_packed_subpoints() is None
+    expected = TrajectoryConverter._get_spatial_bundle_data_subpoints(dense)
+    for agent_data in [packed, copied]:
+        assert agent_data.get_subpoints(0, 0).tolist() == [[1.0, 2.0, 3.0]]
+        assert (
+            TrajectoryConverter._get_spatial_bundle_data_subpoints(agent_data)
+            == expected
+        )
+    # raising the count past what was packed reads zero padding like dense
+    packed.n_subpoints[0, 1] = 2
+    assert packed.get_subpoints(0, 1).tolist() == [[0.0, 0.0, 0.0], [0.0, 0.0, 0.0]]
+
+
+def test_default_arrays_are_writable():
+    agent_data = copy.deepcopy(_agent_data([1], [["A"]], width=1))
+    agent_data.rotations[0, 0] = [90.0, 0.0, 0.0]
+    agent_data.n_subpoints[0, 0] = 1
+    assert agent_data.rotations[0, 0].tolist() == [90.0, 0.0, 0.0]
+    assert agent_data.n_subpoints.tolist() == [[1]]
+
+
+def test_from_buffer_data_float32():
+    buffer_data = _buffer_data([FIBER_AND_SPHERE, SPHERE])
+    agent_data = AgentData.from_buffer_data(buffer_data, dtype=np.float32)
+    expected = AgentData.from_buffer_data(buffer_data)
+    for name in ["positions", "rotations", "radii", "subpoints"]:
+        assert getattr(agent_data, name).dtype == np.float32
+        assert getattr(expected, name).dtype == np.float64
+        np.testing.assert_allclose(getattr(agent_data, name), getattr(expected, name))
+    assert agent_data.get_subpoints(0, 0).dtype == np.float32
+
+
+def test_from_buffer_data_large_unique_id():
+    large_id = 3000000000.0
+    agent_data = AgentData.from_buffer_data(
+        _buffer_data([[1000.0, large_id] + SPHERE[2:]])
+    )
+    assert agent_data.unique_ids.tolist() == [[3000000000]]
@@ -1,10 +1,13 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 
+import numpy as np
 import pytest
 
 from simulariumio import FileConverter
+from simulariumio.exceptions import DataError
 from simulariumio.filters import TransformSpatialAxesFilter
+from simulariumio.tests.conftest import assert_buffer_equal, three_default_agents
 
 
 @pytest.mark.parametrize(
@@ -184,9 +187,48 @@ from simulariumio.filters import TransformSpatialAxesFilter
         ),
     ],
 )
-def test_transform_spatial_axes_filter(input_path, _filter, expected_data):
-    converter = FileConverter(input_path)
+def test_transform_spatial_axes_filter(
+    converter_cache, input_path, _filter, expected_data
+):
+    converter = converter_cache(FileConverter, input_path)
     filtered_data = converter.filter_data([_filter])
     buffer_data = converter._read_trajectory_data(filtered_data)
-    assert expected_data == buffer_data
+    assert_buffer_equal(expected_data, buffer_data)
     assert converter._check_agent_ids_are_unique_per_frame(buffer_data)
+
+
+def test_transform_spatial_axes_filter_integer_positions():
+    data = three_default_agents()
+    data.agent_data.positions = np.arange(27).reshape((3, 3, 3))
+    filtered_data = TransformSpatialAxesFilter(axes_mapping=["+X", "-Z", "+Y"]).apply(
+        data
+    )
+    assert filtered_data.agent_data.positions[0].tolist() == [
+        [0, -2, 1],
+        [3, -5, 4],
+        [6, -8, 7],
+    ]
+
+
+@pytest.mark.parametrize(
+    "axes_mapping",
+    [
+        pytest.param(
+            ["+X", "-Z"],
+            marks=pytest.mark.raises(exception=DataError),
+            # too few axes
+        ),
+        pytest.param(
+            ["+X", "-W", "+Y"],
+            marks=pytest.mark.raises(exception=DataError),
+            # no axis name
+        ),
+        pytest.param(
+            ["+X", "-XZ", "+Y"],
+            marks=pytest.mark.raises(exception=DataError),
+            # more than one axis name
+        ),
+    ],
+)
+def test_transform_spatial_axes_filter_invalid_mapping(axes_mapping):
+    TransformSpatialAxesFilter(axes_mapping=axes_mapping)
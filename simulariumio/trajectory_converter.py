@@ -126,7 +126,7 @@ class TrajectoryConverter:
             "bundleStart": 0,
             "bundleSize": totalSteps,
         }
-        if input_data.agent_data.subpoints is not None:
+        if input_data.agent_data.has_subpoints:
             spatialData[
                 "bundleData"
             ] = TrajectoryConverter._get_spatial_bundle_data_subpoints(
@@ -201,17 +201,15 @@ class TrajectoryConverter:
                 n_subpoints = int(agent_data.n_subpoints[t][n])
                 if n_subpoints > 0:
                     # add subpoints to fiber agent
-                    subpoints = [3 * n_subpoints]
-                    for p in range(n_subpoints):
-                        for d in range(3):
-                            subpoints.append(agent_data.subpoints[t][n][p][d])
+                    agent_subpoints = agent_data.get_subpoints(t, n)
+                    local_buf[i + V1_SPATIAL_BUFFER_STRUCT.NSP_INDEX] = 3 * n_subpoints
+                    # copy the subpoints straight into the buffer
                     local_buf[
                         i
-                        + V1_SPATIAL_BUFFER_STRUCT.NSP_INDEX : i
-                        + V1_SPATIAL_BUFFER_STRUCT.NSP_INDEX
-                        + 1
+                        + V1_SPATIAL_BUFFER_STRUCT.SP_INDEX : i
+                        + V1_SPATIAL_BUFFER_STRUCT.SP_INDEX
                         + 3 * n_subpoints
-                    ] = subpoints
+                    ] = agent_subpoints.ravel()
                     i += (
                         V1_SPATIAL_BUFFER_STRUCT.VALUES_PER_AGENT - 1
                     ) + 3 * n_subpoints
@@ -244,7 +242,7 @@ class TrajectoryConverter:
                                 + V1_SPATIAL_BUFFER_STRUCT.POSX_INDEX : i
                                 + V1_SPATIAL_BUFFER_STRUCT.POSX_INDEX
                                 + 3
-                            ] = agent_data.subpoints[t][n][p]
+                            ] = agent_subpoints[p]
                             local_buf[i + V1_SPATIAL_BUFFER_STRUCT.R_INDEX] = 0.5
                             i += V1_SPATIAL_BUFFER_STRUCT.VALUES_PER_AGENT - 1
                 else:
@@ -259,44 +257,30 @@ class TrajectoryConverter:
     ) -> List[Dict[str, Any]]:
         """
         Return the spatialData's bundleData for a simulation
-        of agents without subpoints, using list slicing for speed
+        of agents without subpoints, filling columns of a per-agent matrix
         """
         bundle_data: List[Dict[str, Any]] = []
         max_n_agents = int(np.amax(agent_data.n_agents, 0))
-        ix_positions = np.empty((3 * max_n_agents,), dtype=int)
-        ix_rotations = np.empty((3 * max_n_agents,), dtype=int)
         buffer_struct = V1_SPATIAL_BUFFER_STRUCT
-        for i in range(max_n_agents):
-            ix_positions[3 * i : 3 * i + 3] = np.arange(
-                i * (buffer_struct.VALUES_PER_AGENT - 1) + buffer_struct.POSX_INDEX,
-                i * (buffer_struct.VALUES_PER_AGENT - 1) + buffer_struct.POSX_INDEX + 3,
-            )
-            ix_rotations[3 * i : 3 * i + 3] = np.arange(
-                i * (buffer_struct.VALUES_PER_AGENT - 1) + buffer_struct.ROTX_INDEX,
-                i * (buffer_struct.VALUES_PER_AGENT - 1) + buffer_struct.ROTX_INDEX + 3,
-            )
-        frame_buf = np.zeros((buffer_struct.VALUES_PER_AGENT - 1) * max_n_agents)
+        # one row of values per agent, the subpoints column stays zero
+        frame_buf = np.zeros((max_n_agents, buffer_struct.VALUES_PER_AGENT - 1))
         for t in range(len(agent_data.times)):
             frame_data = {}
             frame_data["frameNumber"] = t
             frame_data["time"] = float(agent_data.times[t])
             n = int(agent_data.n_agents[t])
-            local_buf = frame_buf[: (buffer_struct.VALUES_PER_AGENT - 1) * n]
-            local_buf[
-                buffer_struct.VIZ_TYPE_INDEX :: buffer_struct.VALUES_PER_AGENT - 1
-            ] = agent_data.viz_types[t, :n]
+            local_buf = frame_buf[:n]
+            local_buf[:, buffer_struct.VIZ_TYPE_INDEX] = agent_data.viz_types[t, :n]
+            local_buf[:, buffer_struct.UID_INDEX] = agent_data.unique_ids[t, :n]
+            local_buf[:, buffer_struct.TID_INDEX] = agent_data.type_ids[t, :n]
             local_buf[
-                buffer_struct.UID_INDEX :: buffer_struct.VALUES_PER_AGENT - 1
-            ] = agent_data.unique_ids[t, :n]
+                :, buffer_struct.POSX_INDEX : buffer_struct.POSX_INDEX + 3
+            ] = agent_data.positions[t, :n]
             local_buf[
-                buffer_struct.TID_INDEX :: buffer_struct.VALUES_PER_AGENT - 1
-            ] = agent_data.type_ids[t, :n]
-            local_buf[ix_positions[: 3 * n]] = agent_data.positions[t, :n].flatten()
-            local_buf[ix_rotations[: 3 * n]] = agent_data.rotations[t, :n].flatten()
-            local_buf[
-                buffer_struct.R_INDEX :: buffer_struct.VALUES_PER_AGENT - 1
-            ] = agent_data.radii[t, :n]
-            frame_data["data"] = local_buf.tolist()
+                :, buffer_struct.ROTX_INDEX : buffer_struct.ROTX_INDEX + 3
+            ] = agent_data.rotations[t, :n]
+            local_buf[:, buffer_struct.R_INDEX] = agent_data.radii[t, :n]
+            frame_data["data"] = local_buf.ravel().tolist()
             bundle_data.append(frame_data)
         return bundle_data
 
@@ -307,32 +291,21 @@ class TrajectoryConverter:
         """
         bundle_data = buffer_data["spatialData"]["bundleData"]
         for t in range(len(bundle_data)):
-            data = bundle_data[t]["data"]
-            i = 1
-            uids = []
-            get_n_subpoints = False
-            while i < len(data):
-                # get the number of subpoints
-                # in order to correctly increment index
-                if get_n_subpoints:
-                    i += int(
-                        data[i]
-                        + (
-                            V1_SPATIAL_BUFFER_STRUCT.VALUES_PER_AGENT
-                            - V1_SPATIAL_BUFFER_STRUCT.NSP_INDEX
-                        )
-                    )
-                    get_n_subpoints = False
-                    continue
-                # there should be a unique ID at this index, check for duplicate
-                uid = data[i]
-                if uid in uids:
-                    raise Exception(
-                        f"found duplicate ID {uid} in frame {t} at index {i}"
-                    )
-                uids.append(uid)
-                i += V1_SPATIAL_BUFFER_STRUCT.NSP_INDEX - 1
-                get_n_subpoints = True
+            data = np.asarray(bundle_data[t]["data"], dtype=np.float64)
+            offsets, _ = AgentData._scan_frame(data)
+            uid_indices = offsets + V1_SPATIAL_BUFFER_STRUCT.UID_INDEX
+            uids = data[uid_indices]
+            unique_uids, first_indices = np.unique(uids, return_index=True)
+            if unique_uids.size == uids.size:
+                continue
+            # report the first agent whose ID was already used
+            is_duplicate = np.ones(uids.size, dtype=bool)
+            is_duplicate[first_indices] = False
+            n = np.flatnonzero(is_duplicate)[0]
+            raise Exception(
+                f"found duplicate ID {uids[n].item()} in frame {t} "
+                f"at index {uid_indices[n]}"
+            )
         return True
 
     @staticmethod